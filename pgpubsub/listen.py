@@ -1,6 +1,7 @@
 import importlib
 import logging
 import multiprocessing
+import re
 import select
 import sys
 import json
@@ -27,6 +28,9 @@ logger = logging.getLogger(__name__)
 
 POLL = True
 
+# Optional JSON whitespace followed by the opening brace of an object
+_JSON_OBJECT_START = re.compile(r'[ \t\n\r]*\{')
+
 
 def start_listen_in_a_process(
     channels: Union[List[BaseChannel], List[str]] = None,
@@ -114,10 +118,13 @@ def listen_to_channels(channels: Union[List[BaseChannel], List[str]] = None):
     cursor = connection.cursor()
     # Notifications are started to being delivered only after the transaction commits.
     # Check LISTEN documentation for detailed description.
+    # All LISTEN statements are sent in a single round trip.
     with transaction.atomic():
         for channel in channels:
             logger.info(f'Listening on {channel.name()}\n')
-            cursor.execute(f'LISTEN {channel.listen_safe_name()};')
+        cursor.execute(
+            ' '.join(f'LISTEN {channel.listen_safe_name()};' for channel in channels)
+        )
     return ConnectionWrapper(connection.connection)
 
 
@@ -187,11 +194,20 @@ class LockableNotificationProcessor(NotificationProcessor):
     def process_by_id(self):
         """To account for payload drift where the payload filter cannot find the notification
         due to a field in the model instance changing"""
+        # Only a JSON object can carry the model instance ID, so reject anything
+        # else without paying for a failed parse. match() stops at the first
+        # non-whitespace character and does not copy the payload.
+        if not _JSON_OBJECT_START.match(self.notification.payload):
+            logger.warning(
+                'Payload on channel %s is not a JSON object, cannot look up the model instance ID',
+                self.notification.channel,
+            )
+            return
         try:
             payload_data = json.loads(self.notification.payload)
             if 'new' in payload_data and 'id' in payload_data['new']:
                 object_id = payload_data['new']['id']
-                logger.info(f'Exact payload failed, trying model instance ID {object_id}')
+                logger.info('Exact payload failed, trying model instance ID %s', object_id)
 
                 id_filter = Q(payload__new__id=object_id) & get_extra_filter()
                 notification = Notification.objects.select_for_update(
@@ -201,20 +217,19 @@ class LockableNotificationProcessor(NotificationProcessor):
                 ).first()
 
                 if notification:
-                    logger.info(f'Obtained lock via model instance ID: {notification.id}')
+                    logger.info('Obtained lock via model instance ID: %s', notification.id)
                     self.notification = notification
                     self._execute()
                     self.notification.delete()
                 else:
-                    logger.info(f'No notification found for model instance ID {object_id}')
+                    logger.info('No notification found for model instance ID %s', object_id)
 
         except Exception as e:
-            logger.error(f"Error while trying to find notification by ID: {e}", exc_info=e)
+            logger.error("Error while trying to find notification by ID: %s", e, exc_info=e)
             pass
 
     def process(self):
-        logger.info(
-            f'Processing notification for {self.channel_cls.name()}')
+        logger.info('Processing notification for %s', self.channel_cls.name())
         payload_filter = (
             Q(payload=CastToJSONB(Value(self.notification.payload))) |
             Q(payload=self.notification.payload)
@@ -229,8 +244,8 @@ class LockableNotificationProcessor(NotificationProcessor):
         )
         if notification is None:
 
-            logger.info(f'Could not obtain a lock on notification '
-                        f'{self.notification.pid}. Attempt to process by id.\n')
+            logger.info('Could not obtain a lock on notification '
+                        '%s. Attempt to process by id.\n', self.notification.pid)
             self.process_by_id()
             notification_without_skip_locked = (
                 Notification.objects.select_for_update(
@@ -239,12 +254,13 @@ class LockableNotificationProcessor(NotificationProcessor):
                     channel=self.notification.channel,
                 ).first()
             )
-            logger.info(f"locked pgpubsub notification: {notification_without_skip_locked}")
-            logger.info(f"payload filter: {payload_filter}")
-            logger.info(f"channel: {self.notification.channel}")
-            logger.info(f"postgres notification payload {self.notification.payload}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("locked pgpubsub notification: %s", notification_without_skip_locked)
+                logger.info("payload filter: %s", payload_filter)
+                logger.info("channel: %s", self.notification.channel)
+                logger.info("postgres notification payload %s", self.notification.payload)
         else:
-            logger.info(f'Obtained lock on {notification}')
+            logger.info('Obtained lock on %s', notification)
             self.notification = notification
             self._execute()
             self.notification.delete()
@@ -1,13 +1,207 @@
+import functools
 import logging
+import multiprocessing.util
 import os
-from typing import Optional
+import sys
+import threading
+import time
+import weakref
+from logging.handlers import MemoryHandler
+from typing import List, Optional
+
+DEFAULT_LOG_FORMAT = "%(asctime)s %(levelname).4s %(message)s"
+
+_LOG_FILE_NAME = "pgpubsub.log"
+
+
+class AppendFdHandler(logging.Handler):
+    """
+    A handler that writes formatted records with a single ``os.write`` on a
+    file descriptor opened with ``O_APPEND``, either one record at a time
+    or a whole batch through ``handle_batch``.
+
+    The kernel performs appends of this kind atomically, so records written
+    by several listener processes sharing one log file do not interleave.
+    """
+
+    terminator = '\n'
+
+    def __init__(self, filename: str, encoding: str = 'utf-8'):
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.encoding = encoding
+        self.fd = os.open(self.baseFilename, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def handle_batch(self, records: List[logging.LogRecord]) -> None:
+        """Write the records that pass this handler's filters with one ``os.write``."""
+        self.acquire()
+        try:
+            self._write(''.join(
+                self.format(record) + self.terminator
+                for record in records if self.filter(record)
+            ))
+        except Exception:
+            self.handleError(records[-1])
+        finally:
+            self.release()
+
+    def _write(self, msg: str) -> None:
+        data = msg.encode(self.encoding, 'backslashreplace')
+        # Regular files only return short writes when the disk fills up
+        while data:
+            data = data[os.write(self.fd, data):]
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            if self.fd is not None:
+                os.close(self.fd)
+                self.fd = None
+        finally:
+            self.release()
+        super().close()
+
+
+class IntervalMemoryHandler(MemoryHandler):
+    """
+    A ``MemoryHandler`` that also flushes its buffer every ``flush_interval``
+    seconds from a daemon thread.
+
+    The buffer is flushed before the process forks and cleared in the child,
+    so buffered records are neither lost nor written twice. Children started
+    by ``multiprocessing`` flush again on their way out, as they exit through
+    ``os._exit`` without running ``logging.shutdown``.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        flushLevel: int = logging.ERROR,
+        target: Optional[logging.Handler] = None,
+        flush_interval: float = 1.0,
+    ):
+        super().__init__(capacity, flushLevel=flushLevel, target=target)
+        self.flush_interval = flush_interval
+        self._start_flusher()
+        _interval_handlers.add(self)
+        multiprocessing.util.register_after_fork(self, IntervalMemoryHandler._flush_at_exit)
+
+    def _start_flusher(self) -> None:
+        self._stopped = threading.Event()
+        threading.Thread(
+            target=self._run_flusher,
+            args=(self._stopped,),
+            name='pgpubsub-log-flusher',
+            daemon=True,
+        ).start()
+
+    def _run_flusher(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        # Hand the whole buffer to an AppendFdHandler so it is written with
+        # one os.write instead of one per record
+        self.acquire()
+        try:
+            if self.buffer and isinstance(self.target, AppendFdHandler):
+                self.target.handle_batch(self.buffer)
+                self.buffer.clear()
+            else:
+                super().flush()
+        finally:
+            self.release()
+
+    def _after_fork_in_child(self) -> None:
+        # The parent flushed before forking, so anything left was logged by
+        # another thread in the meantime and belongs to the parent.
+        self.buffer.clear()
+        self._start_flusher()
+
+    def _flush_at_exit(self) -> None:
+        multiprocessing.util.Finalize(None, self.flush, exitpriority=0)
+
+    def close(self) -> None:
+        self._stopped.set()
+        _interval_handlers.discard(self)
+        super().close()
+
+
+_interval_handlers = weakref.WeakSet()
+
+
+def _flush_interval_handlers() -> None:
+    for handler in list(_interval_handlers):
+        handler.flush()
+
+
+def _reinit_interval_handlers() -> None:
+    for handler in list(_interval_handlers):
+        handler._after_fork_in_child()
+
+
+if hasattr(os, 'register_at_fork'):  # pragma: no branch
+    os.register_at_fork(
+        before=_flush_interval_handlers,
+        after_in_child=_reinit_interval_handlers,
+    )
+
+
+class _DefaultFormatter(logging.Formatter):
+    """
+    Formatter equivalent to ``logging.Formatter(DEFAULT_LOG_FORMAT)``.
+
+    The message is assembled directly instead of through %-style
+    substitution, and the timestamp text is reused for records logged
+    within the same second.
+    """
+
+    def __init__(self):
+        super().__init__(DEFAULT_LOG_FORMAT)
+        self._cached_time = (None, '')
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, text = self._cached_time
+        if second != cached_second:
+            text = time.strftime(self.default_time_format, self.converter(record.created))
+            self._cached_time = (second, text)
+        return self.default_msec_format % (text, record.msecs)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        return f'{record.asctime} {record.levelname[:4]} {record.message}'
+
+
+@functools.lru_cache(maxsize=1)
+def _default_log_dir() -> str:
+    return os.getenv("PGPUBSUB_LOG_DIR", "./logs")
+
+
+@functools.lru_cache(maxsize=4)
+def _log_path(log_dir: str) -> str:
+    return os.path.join(log_dir, _LOG_FILE_NAME)
+
+
+def _ensure_log_dir(log_dir: str) -> None:
+    # A single stat in the common case; the directory may have been removed
+    # since the last call, so its existence is checked every time.
+    if not os.path.isdir(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
 
 
 def setup_pgpubsub_logging(
     log_dir: Optional[str] = None,
     log_level: str = "INFO",
-    log_format: str = "%(asctime)s %(levelname).4s %(message)s",
-    propagate: bool = False
+    log_format: str = DEFAULT_LOG_FORMAT,
+    propagate: bool = False,
+    buffer_capacity: int = 1024,
+    flush_interval: float = 1.0,
 ) -> None:
     """
     Configure logging for the pgpubsub package.
@@ -18,6 +212,11 @@ def setup_pgpubsub_logging(
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_format: Format string for log messages
         propagate: Whether to propagate to parent loggers
+        buffer_capacity: Number of records buffered in memory before they are
+                         written to the log file. Records at ERROR or above
+                         are written immediately.
+        flush_interval: Seconds after which buffered records are written to
+                        the log file even if the buffer is not full.
     
     Example:
         # In your Django project's settings.py or management command:
@@ -30,40 +229,113 @@ def setup_pgpubsub_logging(
     """
     # Determine log directory
     if log_dir is None:
-        log_dir = os.getenv("PGPUBSUB_LOG_DIR", "./logs")
-    
-    # Create logs directory if it doesn't exist
-    os.makedirs(log_dir, exist_ok=True)
+        log_dir = _default_log_dir()
 
     # Get the pgpubsub logger (parent of all pgpubsub.* loggers)
     pgpubsub_logger = logging.getLogger('pgpubsub')
-    
-    # Remove existing handlers to avoid duplicates
+
+    # Nothing to do if the handler installed by an earlier call with these
+    # parameters is still the logger's only handler
+    config = (log_dir, log_level.upper(), log_format, propagate, buffer_capacity, flush_interval)
+    installed_handler = getattr(pgpubsub_logger, '_pgpubsub_handler', None)
+    if pgpubsub_logger.handlers == [installed_handler] and pgpubsub_logger._pgpubsub_cfg == config:
+        return
+
+    # Create logs directory if it doesn't exist
+    _ensure_log_dir(log_dir)
+
+    # Close and remove existing handlers to avoid duplicates and leaked file descriptors
+    for handler in pgpubsub_logger.handlers:
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
     pgpubsub_logger.handlers.clear()
     
     # Create file handler
-    file_handler = logging.FileHandler(
-        os.path.join(log_dir, "pgpubsub.log")
-    )
+    log_path = _log_path(log_dir)
+    if sys.platform == 'win32':
+        file_handler = logging.FileHandler(log_path)
+    else:
+        file_handler = AppendFdHandler(log_path)
     file_handler.setLevel(log_level.upper())
     
     # Create formatter
-    formatter = logging.Formatter(log_format)
+    if log_format == DEFAULT_LOG_FORMAT:
+        formatter = _DefaultFormatter()
+    else:
+        formatter = logging.Formatter(log_format)
     file_handler.setFormatter(formatter)
-    
+
+    # Buffer records in memory so the listener loop does not block on a
+    # write per record
+    memory_handler = IntervalMemoryHandler(
+        capacity=buffer_capacity,
+        flushLevel=logging.ERROR,
+        target=file_handler,
+        flush_interval=flush_interval,
+    )
+    memory_handler.setLevel(log_level.upper())
+
     # Add handler to pgpubsub logger
-    pgpubsub_logger.addHandler(file_handler)
+    pgpubsub_logger.addHandler(memory_handler)
     pgpubsub_logger.setLevel(log_level.upper())
     
     # Configure propagation
     pgpubsub_logger.propagate = propagate
+    pgpubsub_logger._pgpubsub_cfg = config
+    pgpubsub_logger._pgpubsub_handler = memory_handler
+
+
+def _build_pgpubsub_logging_dict(log_dir: str, buffer_capacity: int, flush_interval: float) -> dict:
+    """Build the pgpubsub LOGGING sections without touching the filesystem."""
+    return {
+        'handlers': {
+            'pgpubsub_file': {
+                'level': 'INFO',
+                'class': 'logging.FileHandler',
+                'filename': _log_path(log_dir),
+                'formatter': 'pgpubsub_formatter',
+            },
+            'pgpubsub_buffer': {
+                'level': 'INFO',
+                'class': 'pgpubsub.logging_utils.IntervalMemoryHandler',
+                'capacity': buffer_capacity,
+                'flushLevel': logging.ERROR,
+                'target': 'pgpubsub_file',
+                'flush_interval': flush_interval,
+            },
+        },
+        'formatters': {
+            'pgpubsub_formatter': {
+                'format': DEFAULT_LOG_FORMAT,
+            },
+        },
+        'loggers': {
+            'pgpubsub': {
+                'handlers': ['pgpubsub_buffer'],
+                'level': 'INFO',
+                'propagate': False,
+            },
+        },
+    }
 
 
-def configure_django_logging_for_pgpubsub() -> dict:
+def configure_django_logging_for_pgpubsub(
+    buffer_capacity: int = 1024,
+    flush_interval: float = 1.0,
+) -> dict:
     """
     Return a Django LOGGING configuration dict that includes pgpubsub file logging.
     
     This can be merged with your existing Django LOGGING configuration.
+
+    Args:
+        buffer_capacity: Number of records buffered in memory before they are
+                         written to the log file. Records at ERROR or above
+                         are written immediately.
+        flush_interval: Seconds after which buffered records are written to
+                        the log file even if the buffer is not full.
     
     Example:
         # In settings.py
@@ -81,31 +353,9 @@ def configure_django_logging_for_pgpubsub() -> dict:
         LOGGING['formatters'].update(pgpubsub_config['formatters'])
         LOGGING['loggers'].update(pgpubsub_config['loggers'])
     """
-    log_dir = os.getenv("PGPUBSUB_LOG_DIR", "./logs")
-    os.makedirs(log_dir, exist_ok=True)
-    
-    return {
-        'handlers': {
-            'pgpubsub_file': {
-                'level': 'INFO',
-                'class': 'logging.FileHandler',
-                'filename': os.path.join(log_dir, 'pgpubsub.log'),
-                'formatter': 'pgpubsub_formatter',
-            },
-        },
-        'formatters': {
-            'pgpubsub_formatter': {
-                'format': '%(asctime)s %(levelname).4s %(message)s',
-            },
-        },
-        'loggers': {
-            'pgpubsub': {
-                'handlers': ['pgpubsub_file'],
-                'level': 'INFO',
-                'propagate': False,
-            },
-        },
-    }
+    log_dir = _default_log_dir()
+    _ensure_log_dir(log_dir)
+    return _build_pgpubsub_logging_dict(log_dir, buffer_capacity, flush_interval)
 
 
 def integrate_pgpubsub_logging_with_django(logging_config: dict) -> dict:
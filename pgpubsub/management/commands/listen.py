@@ -6,7 +6,7 @@ from django.core.management import BaseCommand
 from django.db import connection
 
 from pgpubsub.listen import listen, start_listen_in_a_process
-from pgpubsub.logging_utils import setup_pgpubsub_logging
+from pgpubsub.logging_utils import DEFAULT_LOG_FORMAT, setup_pgpubsub_logging
 
 
 class Command(BaseCommand):
@@ -64,7 +64,7 @@ class Command(BaseCommand):
         )
         parser.add_argument(
             "--logformat",
-            default="%(asctime)s %(levelname).4s %(message)s",
+            default=DEFAULT_LOG_FORMAT,
             help="Provide logging format. Example --logformat '%%(asctime)s %%(levelname)s %%(message)s'",
         )
 
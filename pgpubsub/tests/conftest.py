@@ -1,5 +1,6 @@
 import pytest
 from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
 from pgpubsub.listen import listen_to_channels
 
 @pytest.fixture()
@@ -12,3 +13,9 @@ def tx_start_time(django_db_setup):
     with connection.cursor() as cursor:
         cursor.execute("SELECT now();")
         return cursor.fetchone()[0]
+
+
+@pytest.fixture(scope='session')
+def latest_tests_migration_id(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        return MigrationRecorder.Migration.objects.filter(app='tests').latest('id').id
@@ -1,22 +1,60 @@
+from contextlib import contextmanager
 import os
+import shutil
 import tempfile
 import logging
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 import pytest
 from django.core.management import call_command
 from django.test import TestCase
 
 
+@contextmanager
+def _env(key, value):
+    """Temporarily set a single environment variable."""
+    old = os.environ.get(key)
+    os.environ[key] = value
+    try:
+        yield
+    finally:
+        if old is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = old
+
+
 class TestListenCommand(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.log_file = os.path.join(cls.temp_dir, "pgpubsub.log")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+        super().tearDownClass()
+
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.log_file = os.path.join(self.temp_dir, "pgpubsub.log")
+        pgpubsub_logger = logging.getLogger('pgpubsub')
+        self._logger_state = (pgpubsub_logger.level, pgpubsub_logger.propagate)
 
     def tearDown(self):
-        # Clean up temp files
+        # Reset the pgpubsub logger so later tests see it as it was before
+        pgpubsub_logger = logging.getLogger('pgpubsub')
+        for handler in pgpubsub_logger.handlers:
+            target = getattr(handler, 'target', None)
+            handler.close()
+            if target is not None:
+                target.close()
+        pgpubsub_logger.handlers.clear()
+        pgpubsub_logger.level, pgpubsub_logger.propagate = self._logger_state
+        pgpubsub_logger.__dict__.pop('_pgpubsub_cfg', None)
+        pgpubsub_logger.__dict__.pop('_pgpubsub_handler', None)
+
+        # Clean up the log file shared through the class temp dir
         if os.path.exists(self.log_file):
             os.remove(self.log_file)
-        os.rmdir(self.temp_dir)
 
     @patch('pgpubsub.management.commands.listen.listen')
     def test_listen_command_creates_log_file(self, mock_listen):
@@ -27,7 +65,7 @@ class TestListenCommand(TestCase):
         mock_listen.return_value = None
 
         # Use environment variable to set log directory
-        with patch.dict(os.environ, {'PGPUBSUB_LOG_DIR': self.temp_dir}):
+        with _env('PGPUBSUB_LOG_DIR', self.temp_dir):
             # Run the command - the actual handle method will create the log file
             call_command('listen', '--channels', 'test_channel', '--worker')
 
@@ -47,8 +85,6 @@ class TestListenCommand(TestCase):
         # Mock the handle method to use our test directory
         with patch('pgpubsub.management.commands.listen.Command.handle') as mock_handle:
             def side_effect(*args, **options):
-                import os
-
                 # This should create the directory if it doesn't exist
                 os.makedirs(test_log_dir, exist_ok=True)
 
@@ -75,7 +111,7 @@ class TestListenCommand(TestCase):
         mock_listen.return_value = None
 
         with patch('pgpubsub.management.commands.listen.setup_pgpubsub_logging') as mock_basic_config:
-            with patch.dict(os.environ, {'PGPUBSUB_LOG_DIR': self.temp_dir}):
+            with _env('PGPUBSUB_LOG_DIR', self.temp_dir):
                 call_command(
                     'listen',
                     '--channels', 'test_channel',
@@ -107,7 +143,8 @@ class TestListenCommand(TestCase):
         setup_pgpubsub_logging(
             log_dir=self.temp_dir,
             log_level="DEBUG",
-            log_format="%(levelname)s: %(message)s"
+            log_format="%(levelname)s: %(message)s",
+            flush_interval=60,
         )
 
         # Test that pgpubsub logger is configured
@@ -118,10 +155,14 @@ class TestListenCommand(TestCase):
         # Test that logging works
         pgpubsub_logger.info("Test message")
 
+        # The record is held in memory until the buffering handler is flushed
+        handler = pgpubsub_logger.handlers[0]
+        self.assertEqual([record.getMessage() for record in handler.buffer], ["Test message"])
+        handler.flush()
+
         # Verify log file was created
         self.assertTrue(os.path.exists(self.log_file))
 
         # Verify log content
-        with open(self.log_file, 'r') as f:
-            content = f.read()
-            self.assertIn("Test message", content)
+        with open(self.log_file, 'rb') as f:
+            self.assertIn(b"Test message", f.read())
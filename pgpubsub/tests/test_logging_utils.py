@@ -0,0 +1,237 @@
+"""Tests for pgpubsub.logging_utils that need neither the database nor the listen command"""
+import logging
+import logging.config
+import multiprocessing
+import shutil
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from pgpubsub import logging_utils
+from pgpubsub.logging_utils import (
+    DEFAULT_LOG_FORMAT,
+    AppendFdHandler,
+    IntervalMemoryHandler,
+    _DefaultFormatter,
+    setup_pgpubsub_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def pgpubsub_logger():
+    """Restore the pgpubsub logger to its previous state after each test"""
+    logger = logging.getLogger('pgpubsub')
+    level, propagate = logger.level, logger.propagate
+    yield logger
+    for handler in logger.handlers:
+        target = getattr(handler, 'target', None)
+        handler.close()
+        if target is not None:
+            target.close()
+    logger.handlers.clear()
+    logger.level, logger.propagate = level, propagate
+    logger.__dict__.pop('_pgpubsub_cfg', None)
+    logger.__dict__.pop('_pgpubsub_handler', None)
+
+
+@pytest.fixture
+def log_dir_env(tmp_path, monkeypatch):
+    """Point PGPUBSUB_LOG_DIR at tmp_path, bypassing the value cached for the process"""
+    monkeypatch.setenv('PGPUBSUB_LOG_DIR', str(tmp_path))
+    logging_utils._default_log_dir.cache_clear()
+    yield tmp_path
+    logging_utils._default_log_dir.cache_clear()
+
+
+def _log_from_child():
+    logging.getLogger('pgpubsub.listen').info("Child message")
+
+
+def test_flushes_on_interval(tmp_path, pgpubsub_logger):
+    """Test that buffered records reach the log file without a further record"""
+    setup_pgpubsub_logging(log_dir=str(tmp_path), flush_interval=0.05)
+    pgpubsub_logger.info("Quiet listener")
+
+    log_file = tmp_path / 'pgpubsub.log'
+    deadline = time.monotonic() + 5
+    while not log_file.exists() or log_file.stat().st_size == 0:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert b"Quiet listener" in log_file.read_bytes()
+
+
+def test_forked_child(tmp_path, pgpubsub_logger):
+    """Test that a forked child writes its own records and none of the parent's twice"""
+    setup_pgpubsub_logging(log_dir=str(tmp_path), flush_interval=60)
+    pgpubsub_logger.info("Restarting process")
+
+    process = multiprocessing.get_context('fork').Process(target=_log_from_child)
+    process.start()
+    process.join()
+    assert process.exitcode == 0
+
+    content = (tmp_path / 'pgpubsub.log').read_bytes()
+    assert content.count(b"Restarting process") == 1
+    assert b"Child message" in content
+
+
+def test_interval_handler_fork_hooks(tmp_path, pgpubsub_logger):
+    """Test the fork hooks that run in the child, outside the reach of coverage"""
+    setup_pgpubsub_logging(log_dir=str(tmp_path), flush_interval=60)
+    handler = pgpubsub_logger.handlers[0]
+    pgpubsub_logger.info("Parent message")
+
+    with patch.object(handler, '_start_flusher') as mock_start_flusher:
+        logging_utils._reinit_interval_handlers()
+    assert handler.buffer == []
+    mock_start_flusher.assert_called_once_with()
+
+    with patch('pgpubsub.logging_utils.multiprocessing.util.Finalize') as mock_finalize:
+        handler._flush_at_exit()
+    mock_finalize.assert_called_once_with(None, handler.flush, exitpriority=0)
+
+
+def test_django_logging_dict(log_dir_env, pgpubsub_logger):
+    """Test that the dict built for Django's LOGGING setting configures buffered file logging"""
+    config = logging_utils.integrate_pgpubsub_logging_with_django(
+        {'version': 1, 'disable_existing_loggers': False}
+    )
+    logging.config.dictConfig(config)
+
+    handler = pgpubsub_logger.handlers[0]
+    assert isinstance(handler, IntervalMemoryHandler)
+    pgpubsub_logger.info("Configured through Django")
+    handler.flush()
+
+    assert b"Configured through Django" in (log_dir_env / 'pgpubsub.log').read_bytes()
+
+
+def test_flush_writes_buffer_at_once(tmp_path, pgpubsub_logger):
+    """Test that flushing the buffer appends all records with a single write"""
+    setup_pgpubsub_logging(log_dir=str(tmp_path), flush_interval=60)
+    handler = pgpubsub_logger.handlers[0]
+    for i in range(3):
+        pgpubsub_logger.info("Batched message %s", i)
+
+    # Count writes made by this handler only, not by other threads
+    with patch.object(handler.target, '_write', wraps=handler.target._write) as mock_write:
+        handler.flush()
+    assert mock_write.call_count == 1
+
+    content = (tmp_path / 'pgpubsub.log').read_bytes()
+    assert content.index(b"Batched message 0") < content.index(b"Batched message 2")
+
+
+def test_append_fd_handler_reports_write_errors(tmp_path):
+    """Test that write failures go through Handler.handleError"""
+    handler = AppendFdHandler(str(tmp_path / 'pgpubsub.log'))
+    handler.close()
+    record = logging.LogRecord('pgpubsub', logging.INFO, __file__, 1, "Lost", (), None)
+
+    with patch.object(handler, 'handleError') as mock_handle_error:
+        handler.emit(record)
+        handler.handle_batch([record])
+    assert mock_handle_error.call_count == 2
+
+
+@patch.object(sys, 'platform', 'win32')
+def test_setup_on_windows(tmp_path, pgpubsub_logger):
+    """Test that setup falls back to logging.FileHandler on Windows"""
+    setup_pgpubsub_logging(log_dir=str(tmp_path), flush_interval=60)
+    handler = pgpubsub_logger.handlers[0]
+    assert isinstance(handler.target, logging.FileHandler)
+    assert not isinstance(handler.target, AppendFdHandler)
+
+    pgpubsub_logger.info("Windows message")
+    handler.flush()
+    assert b"Windows message" in (tmp_path / 'pgpubsub.log').read_bytes()
+
+
+def test_setup_recreates_removed_log_dir(tmp_path):
+    """Test that setup recreates a log directory removed after an earlier setup"""
+    log_dir = tmp_path / 'removed'
+    setup_pgpubsub_logging(log_dir=str(log_dir), log_level="DEBUG")
+    shutil.rmtree(log_dir)
+
+    setup_pgpubsub_logging(log_dir=str(log_dir), log_level="INFO")
+    assert (log_dir / 'pgpubsub.log').is_file()
+
+
+def test_setup_is_idempotent(tmp_path, pgpubsub_logger):
+    """Test that repeated setup with the same parameters keeps the existing handler"""
+    setup_pgpubsub_logging(log_dir=str(tmp_path), log_level="DEBUG")
+    handler = pgpubsub_logger.handlers[0]
+
+    setup_pgpubsub_logging(log_dir=str(tmp_path), log_level="DEBUG")
+    assert pgpubsub_logger.handlers == [handler]
+
+    # Changing a parameter replaces the handler and closes the old file
+    target = handler.target
+    setup_pgpubsub_logging(log_dir=str(tmp_path), log_level="INFO")
+    assert len(pgpubsub_logger.handlers) == 1
+    assert pgpubsub_logger.handlers[0] is not handler
+    assert target.fd is None
+
+
+def test_setup_restores_replaced_handler(tmp_path, pgpubsub_logger):
+    """Test that repeated setup reinstalls its handler after something else replaced it"""
+    setup_pgpubsub_logging(log_dir=str(tmp_path))
+    handler = pgpubsub_logger.handlers[0]
+
+    # e.g. Django's dictConfig swapping in its own handlers
+    pgpubsub_logger.handlers = [logging.NullHandler()]
+    target = handler.target
+    handler.close()
+    target.close()
+
+    setup_pgpubsub_logging(log_dir=str(tmp_path))
+    assert len(pgpubsub_logger.handlers) == 1
+    assert isinstance(pgpubsub_logger.handlers[0], IntervalMemoryHandler)
+    assert pgpubsub_logger.handlers[0] is not handler
+
+
+def test_default_formatter_matches_stock_formatter():
+    """Test that _DefaultFormatter renders like logging.Formatter and reuses the timestamp text"""
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        exc_info = sys.exc_info()
+
+    created = int(time.time()) + 0.25
+    records = []
+    for level, exc in [(logging.INFO, None), (logging.ERROR, exc_info)]:
+        record = logging.LogRecord(
+            'pgpubsub.listen', level, __file__, 1, "Processing %s", ("channel",), exc
+        )
+        record.created, record.msecs = created, 250.0
+        records.append(record)
+
+    formatter = _DefaultFormatter()
+    with patch.object(formatter, 'converter', wraps=formatter.converter) as mock_converter:
+        for record in records:
+            assert formatter.format(record) == logging.Formatter(DEFAULT_LOG_FORMAT).format(record)
+    # The second record is formatted with the cached timestamp text
+    assert mock_converter.call_count == 1
+
+
+def test_default_log_dir_is_read_once_per_process(log_dir_env, monkeypatch):
+    """Test that log_dir=None uses PGPUBSUB_LOG_DIR as first read, ignoring later changes"""
+    setup_pgpubsub_logging()
+    assert (log_dir_env / 'pgpubsub.log').is_file()
+
+    monkeypatch.setenv('PGPUBSUB_LOG_DIR', str(log_dir_env / 'later'))
+    config = logging_utils.configure_django_logging_for_pgpubsub()
+    assert config['handlers']['pgpubsub_file']['filename'] == str(log_dir_env / 'pgpubsub.log')
+    assert not (log_dir_env / 'later').exists()
+
+
+def test_default_log_dir_without_env(monkeypatch):
+    """Test that the log directory defaults to ./logs when PGPUBSUB_LOG_DIR is unset"""
+    monkeypatch.delenv('PGPUBSUB_LOG_DIR', raising=False)
+    logging_utils._default_log_dir.cache_clear()
+    try:
+        assert logging_utils._default_log_dir() == './logs'
+    finally:
+        logging_utils._default_log_dir.cache_clear()
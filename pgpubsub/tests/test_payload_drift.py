@@ -1,15 +1,37 @@
 """Tests for payload drift handling in LockableNotificationProcessor"""
+from contextlib import contextmanager
 import json
+import logging
+from types import MappingProxyType, SimpleNamespace
 import pytest
-from unittest.mock import Mock
-from django.db import transaction
+from django.db import connection
 
-from pgpubsub.compatibility import Notify
 from pgpubsub.listen import LockableNotificationProcessor
 from pgpubsub.models import Notification
 from pgpubsub.tests.channels import AuthorTriggerChannel
 from pgpubsub.tests.models import Author
 
+pytestmark = pytest.mark.django_db
+
+CHANNEL_NAME = AuthorTriggerChannel.listen_safe_name()
+
+# Primary key of the author the stored notifications refer to
+AUTHOR_ID = 1
+
+# Fields shared by every Author trigger payload
+_BASE = MappingProxyType({'app': 'tests', 'model': 'Author'})
+
+
+class _NoopConnection:
+    """Stand-in for the listener connection wrapper whose methods do nothing"""
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+_NOOP_CONNECTION = _NoopConnection()
+
 
 def create_test_processor(pg_notification):
     """Helper to create a properly configured test processor"""
@@ -17,280 +39,219 @@ def create_test_processor(pg_notification):
     processor.notification = pg_notification
     processor.channel_cls = AuthorTriggerChannel
     processor.callbacks = []
-    processor.connection_wrapper = Mock()
-
-    # Mock _execute to avoid running actual callbacks
-    processor._execute = Mock()
+    processor.connection_wrapper = _NOOP_CONNECTION
 
-    return processor
+    # Count _execute calls instead of running actual callbacks
+    processor._call_count = [0]
 
+    def _execute(*args, **kwargs):
+        processor._call_count[0] += 1
 
-@pytest.mark.django_db(transaction=True)
-def test_process_by_id_success():
-    """Test that process_by_id can find notification when exact payload matching fails"""
-    # Create an author to work with
-    author = Author.objects.create(name='Test Author', age=30)
+    processor._execute = _execute
 
-    # Clear any auto-generated notifications from the Author creation
-    Notification.objects.all().delete()
+    return processor
 
-    # Use the actual channel name from AuthorTriggerChannel
-    channel_name = AuthorTriggerChannel.listen_safe_name()
 
-    # Create a notification with original payload
-    original_payload = {
-        'app': 'tests',
-        'model': 'Author',
-        'new': {
-            'id': author.id,
-            'name': 'Test Author',
-            'age': 30,
-            'active': True
-        },
-        'old': {
-            'id': author.id,
-            'name': 'Old Name',
-            'age': 25,
-            'active': True
-        }
+def make_pg_notification(payload, channel=CHANNEL_NAME, pid=12345):
+    """Helper to build a stand-in for a Postgres Notify, JSON-encoding non-string payloads"""
+    if not isinstance(payload, str):
+        payload = json.dumps(payload)
+    return SimpleNamespace(payload=payload, channel=channel, pid=pid)
+
+
+@contextmanager
+def no_author_triggers():
+    """Helper to write Author rows without firing their pgpubsub triggers"""
+    table = Author._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {table} DISABLE TRIGGER USER')
+        try:
+            yield
+        finally:
+            cursor.execute(f'ALTER TABLE {table} ENABLE TRIGGER USER')
+
+
+@pytest.fixture(scope='module')
+def shared_author(django_db_setup, django_db_blocker):
+    """Author shared by the tests in this module, created once outside their transactions.
+
+    Tests run under the default (non-transactional) django_db mark, so rows they
+    create are rolled back with the test transaction while this author remains.
+    """
+    with django_db_blocker.unblock(), no_author_triggers():
+        author = Author.objects.create(id=AUTHOR_ID, name='Test Author', age=30)
+    yield author
+    with django_db_blocker.unblock(), no_author_triggers():
+        author.delete()
+
+
+ORIGINAL_PAYLOAD = {
+    **_BASE,
+    'new': {
+        'id': AUTHOR_ID,
+        'name': 'Test Author',
+        'age': 30,
+        'active': True
+    },
+    'old': {
+        'id': AUTHOR_ID,
+        'name': 'Old Name',
+        'age': 25,
+        'active': True
     }
+}
+
+DRIFTED_PAYLOAD = {
+    **_BASE,
+    'new': {
+        'id': AUTHOR_ID,
+        'name': 'Test Author',
+        'age': 35,  # This changed, causing payload mismatch
+        'active': True
+    },
+    'old': {
+        'id': AUTHOR_ID,
+        'name': 'Old Name',
+        'age': 30,  # This also changed
+        'active': True
+    }
+}
+
+NON_EXISTENT_ID_PAYLOAD = {
+    **_BASE,
+    'new': {
+        'id': 99999,  # Non-existent ID
+        'name': 'Non-existent Author',
+        'age': 30
+    },
+    'old': {
+        'id': 99999,
+        'name': 'Old Name',
+        'age': 25
+    }
+}
+
+MISSING_ID_PAYLOAD = {
+    **_BASE,
+    'new': {
+        'name': 'Test Author',  # Missing 'id' field
+        'age': 30
+    },
+    'old': {
+        'name': 'Old Name',
+        'age': 25
+    }
+}
 
-    notification = Notification.objects.create(
-        channel=channel_name,
-        payload=original_payload
-    )
-
-    # Create a Postgres notification with drifted payload (age changed)
-    drifted_payload = {
-        'app': 'tests',
-        'model': 'Author',
-        'new': {
-            'id': author.id,
-            'name': 'Test Author',
-            'age': 35,  # This changed, causing payload mismatch
-            'active': True
-        },
-        'old': {
-            'id': author.id,
-            'name': 'Old Name',
-            'age': 30,  # This also changed
-            'active': True
-        }
+MULTIPLE_PAYLOADS = [
+    {
+        **_BASE,
+        'new': {'id': AUTHOR_ID, 'name': f'Name {i}', 'age': 30 + i},
+        'old': {'id': AUTHOR_ID, 'name': 'Old Name', 'age': 25}
+    }
+    for i in range(3)
+]
+
+MULTIPLE_DRIFTED_PAYLOAD = {
+    **_BASE,
+    'new': {
+        'id': AUTHOR_ID,
+        'name': 'Drifted Name',  # Different from stored notifications
+        'age': 50  # Different age
+    },
+    'old': {
+        'id': AUTHOR_ID,
+        'name': 'Old Name',
+        'age': 25
     }
+}
+
+# (stored notification payloads, serialized Postgres notification payload,
+#  whether _execute is expected to run, notifications left afterwards)
+CASES = [
+    # Exact payload matching fails but the model instance ID matches
+    pytest.param([ORIGINAL_PAYLOAD], json.dumps(DRIFTED_PAYLOAD), True, 0, id='success'),
+    # No notification exists for the given ID
+    pytest.param([], json.dumps(NON_EXISTENT_ID_PAYLOAD), False, 0, id='no_matching_id'),
+    # Non-JSON payload is rejected before parsing
+    pytest.param([], 'invalid json', False, 0, id='invalid_payload'),
+    # Payload is missing the 'new.id' field
+    pytest.param([], json.dumps(MISSING_ID_PAYLOAD), False, 0, id='missing_id_in_payload'),
+    # Only one of several notifications for the same ID is processed
+    pytest.param(
+        MULTIPLE_PAYLOADS, json.dumps(MULTIPLE_DRIFTED_PAYLOAD), True, 2, id='multiple_notifications'
+    ),
+]
+
+
+@pytest.mark.parametrize('stored_payloads, payload, expect_execute, expected_count', CASES)
+def test_process_by_id(shared_author, stored_payloads, payload, expect_execute, expected_count):
+    """Test process_by_id falls back to the model instance ID when the exact payload drifts"""
+    Notification.objects.bulk_create(
+        [Notification(channel=CHANNEL_NAME, payload=stored_payload) for stored_payload in stored_payloads]
+    )
 
-    # Create mock Postgres notification
-    pg_notification = Mock(spec=Notify)
-    pg_notification.payload = json.dumps(drifted_payload)
-    pg_notification.channel = channel_name
-    pg_notification.pid = 12345
+    # Create stand-in Postgres notification
+    pg_notification = make_pg_notification(payload)
 
     # Create processor with proper setup
     processor = create_test_processor(pg_notification)
 
     # Count notifications before
-    initial_count = Notification.objects.count()
-    assert initial_count == 1
-
-    # Call process_by_id method within transaction context (as it would be in production)
-    with transaction.atomic():
-        processor.process_by_id()
-
-    # Verify _execute was called
-    processor._execute.assert_called_once()
-
-    # Verify notification was processed and deleted
-    final_count = Notification.objects.count()
-    assert final_count == 0
-
-
-@pytest.mark.django_db(transaction=True)
-def test_process_by_id_no_matching_id():
-    """Test process_by_id when no notification exists for the given ID"""
-    channel_name = AuthorTriggerChannel.listen_safe_name()
-
-    # Create a Postgres notification for non-existent object
-    payload = {
-        'app': 'tests',
-        'model': 'Author',
-        'new': {
-            'id': 99999,  # Non-existent ID
-            'name': 'Non-existent Author',
-            'age': 30
-        },
-        'old': {
-            'id': 99999,
-            'name': 'Old Name',
-            'age': 25
-        }
-    }
-
-    pg_notification = Mock(spec=Notify)
-    pg_notification.payload = json.dumps(payload)
-    pg_notification.channel = channel_name
-    pg_notification.pid = 12345
-
-    processor = create_test_processor(pg_notification)
+    assert Notification.objects.filter(channel=CHANNEL_NAME).count() == len(stored_payloads)
 
-    # Should not raise exception, should handle gracefully
+    # The test transaction stands in for the one process_notifications opens in production
     processor.process_by_id()
 
-    # _execute should not be called since no notification found
-    processor._execute.assert_not_called()
+    assert processor._call_count[0] == (1 if expect_execute else 0)
 
-    # No notifications should be processed
-    assert Notification.objects.count() == 0
+    if expected_count:
+        assert Notification.objects.filter(channel=CHANNEL_NAME).count() == expected_count
+    else:
+        assert not Notification.objects.exists()
 
 
-@pytest.mark.django_db(transaction=True)
-def test_process_by_id_invalid_payload():
-    """Test process_by_id with invalid JSON payload"""
-    channel_name = AuthorTriggerChannel.listen_safe_name()
-
-    pg_notification = Mock(spec=Notify)
-    pg_notification.payload = "invalid json"
-    pg_notification.channel = channel_name
-    pg_notification.pid = 12345
-
-    processor = create_test_processor(pg_notification)
+def test_process_by_id_rejects_non_object_payload(caplog):
+    """Test that a payload that is not a JSON object is rejected with a warning before parsing"""
+    processor = create_test_processor(make_pg_notification('invalid json'))
 
-    # Should handle gracefully without crashing
-    processor.process_by_id()
-
-    # _execute should not be called due to invalid payload
-    processor._execute.assert_not_called()
-
-
-@pytest.mark.django_db(transaction=True)
-def test_process_by_id_missing_id_in_payload():
-    """Test process_by_id when payload is missing 'new.id' field"""
-    channel_name = AuthorTriggerChannel.listen_safe_name()
-
-    payload = {
-        'app': 'tests',
-        'model': 'Author',
-        'new': {
-            'name': 'Test Author',  # Missing 'id' field
-            'age': 30
-        },
-        'old': {
-            'name': 'Old Name',
-            'age': 25
-        }
-    }
-
-    pg_notification = Mock(spec=Notify)
-    pg_notification.payload = json.dumps(payload)
-    pg_notification.channel = channel_name
-    pg_notification.pid = 12345
-
-    processor = create_test_processor(pg_notification)
-
-    # Should handle gracefully
-    processor.process_by_id()
-
-    # _execute should not be called due to missing ID
-    processor._execute.assert_not_called()
-
-
-@pytest.mark.django_db(transaction=True)
-def test_process_by_id_with_multiple_notifications():
-    """Test process_by_id when multiple notifications exist for same ID"""
-    author = Author.objects.create(name='Test Author', age=30)
-
-    # Clear any auto-generated notifications from the Author creation
-    Notification.objects.all().delete()
-
-    channel_name = AuthorTriggerChannel.listen_safe_name()
-
-    # Create multiple notifications for same author
-    for i in range(3):
-        Notification.objects.create(
-            channel=channel_name,
-            payload={
-                'app': 'tests',
-                'model': 'Author',
-                'new': {'id': author.id, 'name': f'Name {i}', 'age': 30 + i},
-                'old': {'id': author.id, 'name': 'Old Name', 'age': 25}
-            }
-        )
-
-    payload = {
-        'app': 'tests',
-        'model': 'Author',
-        'new': {
-            'id': author.id,
-            'name': 'Drifted Name',  # Different from stored notifications
-            'age': 50  # Different age
-        },
-        'old': {
-            'id': author.id,
-            'name': 'Old Name',
-            'age': 25
-        }
-    }
-
-    pg_notification = Mock(spec=Notify)
-    pg_notification.payload = json.dumps(payload)
-    pg_notification.channel = channel_name
-    pg_notification.pid = 12345
-
-    processor = create_test_processor(pg_notification)
-
-    initial_count = Notification.objects.count()
-    assert initial_count == 3
-
-    # Should process one notification
-    # Call process_by_id method within transaction context (as it would be in production)
-    with transaction.atomic():
+    with caplog.at_level(logging.INFO, logger='pgpubsub'):
         processor.process_by_id()
 
-    # _execute should be called once
-    processor._execute.assert_called_once()
+    assert processor._call_count[0] == 0
+    assert [record.levelno for record in caplog.records] == [logging.WARNING]
+    assert 'is not a JSON object' in caplog.records[0].message
 
-    final_count = Notification.objects.count()
-    assert final_count == 2  # One less than before
 
-
-@pytest.mark.django_db(transaction=True)
-def test_integration_exact_payload_vs_id_fallback():
+def test_integration_exact_payload_vs_id_fallback(shared_author):
     """Integration test showing fallback from exact payload to ID matching"""
-    author = Author.objects.create(name='Test Author', age=30)
-
-    # Clear any auto-generated notifications from the Author creation
-    Notification.objects.all().delete()
-
-    channel_name = AuthorTriggerChannel.listen_safe_name()
+    author = shared_author
 
     # Create notification with original data
     original_payload = {
-        'app': 'tests',
-        'model': 'Author',
+        **_BASE,
         'new': {'id': author.id, 'name': 'Test Author', 'age': 30},
         'old': {'id': author.id, 'name': 'Old Name', 'age': 25}
     }
 
     notification = Notification.objects.create(
-        channel=channel_name,
+        channel=CHANNEL_NAME,
         payload=original_payload
     )
 
-    # Test ID fallback with drifted payload
-    drifted_payload = original_payload.copy()
-    drifted_payload['new']['age'] = 35  # Changed age
+    # Test ID fallback with drifted payload (changed age)
+    drifted_payload = {**original_payload, 'new': {**original_payload['new'], 'age': 35}}
+    assert original_payload['new']['age'] == 30
 
-    pg_notification_drift = Mock(spec=Notify)
-    pg_notification_drift.payload = json.dumps(drifted_payload)
-    pg_notification_drift.channel = channel_name
-    pg_notification_drift.pid = 12346
+    pg_notification_drift = make_pg_notification(drifted_payload, pid=12346)
 
     processor_drift = create_test_processor(pg_notification_drift)
 
     # ID fallback should find the notification
-    assert Notification.objects.count() == 1
-    # Call process_by_id method within transaction context (as it would be in production)
-    with transaction.atomic():
-        processor_drift.process_by_id()
+    assert Notification.objects.filter(channel=CHANNEL_NAME).count() == 1
+    # The test transaction stands in for the one process_notifications opens in production
+    processor_drift.process_by_id()
 
     # Should have been processed
-    processor_drift._execute.assert_called_once()
-    assert Notification.objects.count() == 0
+    assert processor_drift._call_count[0] == 1
+    assert not Notification.objects.exists()